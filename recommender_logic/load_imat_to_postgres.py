@@ -1,37 +1,213 @@
 import os
-import json
+import socket
+import struct
 import argparse
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 
 # ijson is used to parse large JSON files in a memory-efficient way
 import ijson
 
+# orjson serializes straight to UTF-8 bytes, much faster than json.dumps
+import orjson
+
+# simdjson parses a whole split file at once (much faster than ijson, but the
+# file has to fit in memory); without it, or with --streaming, we use ijson
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
 # tqdm is used to show progress bars for long-running operations
 from tqdm import tqdm
 
 import psycopg
 from psycopg import sql
-
-import csv
-from io import StringIO
+from psycopg.copy import QueuedLibpqWriter
 
 from dotenv import load_dotenv
 load_dotenv()
 
+def _fastest_ijson_backend():
+    """
+    Prefer the YAJL2 C-based ijson backends; the pure-Python one is a last resort.
+    """
+    for name in ("yajl2_c", "yajl2_cffi", "yajl2"):
+        try:
+            return ijson.get_backend(name)
+        except ImportError:
+            continue
+    return ijson
+
+ijson_backend = _fastest_ijson_backend()
+
+# Read size handed to the JSON parser (bytes); the default 64 KB starves YAJL
+IJSON_BUF_SIZE = 256 * 1024
+
+def parse_split_doc(json_path: Path, streaming: bool = False):
+    """
+    Parses a whole split JSON with simdjson, so the loaders can share one parse.
+
+    Returns None when simdjson is missing, streaming=True, or the file is too big
+    for simdjson (4 GiB limit); the loaders then stream the file with ijson
+    instead, which keeps memory low.
+    """
+    if simdjson is None or streaming:
+        return None
+
+    if json_path.stat().st_size >= simdjson.MAXSIZE_BYTES:
+        print(f"[INFO] {json_path.name} is too large for simdjson, streaming it with ijson")
+        return None
+
+    parser = simdjson.Parser()
+    try:
+        return parser.load(str(json_path))
+    except ValueError as e:
+        # e.g. CAPACITY: the document exceeds what the parser can hold
+        print(f"[INFO] simdjson could not parse {json_path.name} ({e}), streaming it with ijson")
+        return None
+
+def first_split_values(json_path: Path, keys, doc=None) -> dict:
+    """
+    Returns {key: data[key]} for top-level keys of a split JSON (e.g. "info",
+    "license"); keys that are not in the file map to None.
+
+    Uses doc (see parse_split_doc) when given, otherwise one ijson pass over the
+    file that stops as soon as every key has been found.
+    """
+    if doc is not None:
+        return {key: doc.get(key) for key in keys}
+
+    found = dict.fromkeys(keys)
+    pending = set(keys)
+    building = None  # (key, ObjectBuilder) while inside that key's map/array
+
+    with json_path.open("rb") as f:
+        for prefix, event, value in ijson_backend.parse(f, buf_size=IJSON_BUF_SIZE, use_float=True):
+            if building is not None:
+                key, builder = building
+                builder.event(event, value)
+                if prefix != key or event not in ("end_map", "end_array"):
+                    continue
+                found[key] = builder.value
+                building = None
+            elif prefix in pending:
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    building = (prefix, builder)
+                    continue
+                found[prefix] = builder.value
+            else:
+                continue
+
+            pending.discard(prefix)
+            if not pending:
+                break
+
+    return found
+
+def iter_split_items(json_path: Path, key: str, doc=None):
+    """
+    Yields the items of data[key] (e.g. "images", "annotations") from a split JSON.
+
+    Uses doc (see parse_split_doc) when given, otherwise streams the file with ijson.
+    """
+    if doc is not None:
+        yield from doc.get(key, ())
+        return
+
+    with json_path.open("rb") as f:
+        # items(f, "images.item") streams each item inside the images array
+        yield from ijson_backend.items(f, f"{key}.item", buf_size=IJSON_BUF_SIZE, use_float=True)
+
+def to_json_bytes(value) -> bytes:
+    """
+    JSON text (UTF-8 bytes) for a value taken from iter_split_items / the split JSON.
+
+    simdjson proxies already hold the source JSON, so we take their minified
+    form as-is; plain Python objects (from ijson) go through orjson.
+    """
+    mini = getattr(value, "mini", None)
+    if mini is not None:
+        return mini
+    return orjson.dumps(value)
+
+# Optional fixed send/receive buffer size for TCP connections (bytes), from
+# PG_SOCKET_BUFFER_SIZE. Off by default: on Linux a fixed size disables TCP buffer
+# autotuning and is capped by net.core.wmem_max/rmem_max, so only set it on hosts
+# where those limits have been raised and a fixed size is known to help.
+SOCKET_BUFFER_SIZE = int(os.getenv("PG_SOCKET_BUFFER_SIZE") or 0)
+
+def tune_socket(conn: psycopg.Connection):
+    """
+    Applies SOCKET_BUFFER_SIZE (if set) to a TCP connection.
+    Unix-socket connections (local loads) are left as they are.
+    """
+    if not SOCKET_BUFFER_SIZE:
+        return
+
+    # Work on a dup of libpq's fd so closing our socket object leaves libpq's open
+    with socket.socket(fileno=os.dup(conn.pgconn.socket)) as sock:
+        if sock.family == socket.AF_UNIX:
+            return
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+
+# Max distinct labelId combinations kept by cached_json_bytes before it starts over
+LABEL_JSON_CACHE_SIZE = 200_000
+
+def cached_json_bytes(cache: dict, value) -> bytes:
+    """
+    to_json_bytes for lists, memoized in cache (keyed by the tuple of items).
+
+    Many images share the same labelId combination, so each one is serialized
+    once. simdjson proxies are passed through: .mini is already free.
+    """
+    if not isinstance(value, list):
+        return to_json_bytes(value)
+
+    key = tuple(value)
+    data = cache.get(key)
+    if data is None:
+        if len(cache) >= LABEL_JSON_CACHE_SIZE:
+            cache.clear()
+        data = cache[key] = orjson.dumps(value)
+    return data
+
 def get_conn() -> psycopg.Connection:
    """
     Load environment variables from .env file
+
+    An unset/empty PGHOST (or a directory path) makes libpq use the local Unix
+    socket, which skips TCP entirely (see tune_socket for TCP buffer sizes).
    """
-   return psycopg.connect(
-        host=os.getenv("PGHOST"),
+   conn = psycopg.connect(
+        host=os.getenv("PGHOST") or None,
         port=int(os.getenv("PGPORT")),
         dbname=os.getenv("PGDATABASE"),
         user=os.getenv("PGUSER"),
         password=os.getenv("PGPASSWORD"),
-        autocommit=True,
+        # Group work into explicit transactions (conn.transaction()) instead
+        # of committing (and fsyncing) every statement
+        autocommit=False,
     )
+   tune_socket(conn)
+   return conn
+
+def run_with_own_conn(load, *args, **kwargs):
+    """
+    Runs load(conn, *args, **kwargs) on a fresh connection.
+    Used by the worker processes in main, each of which needs its own connection.
+    """
+    conn = get_conn()
+    try:
+        with conn.transaction():
+            load(conn, *args, **kwargs)
+    finally:
+        conn.close()
 
 def create_schema_and_tables(conn):
     with conn.cursor() as cursor:
@@ -62,40 +238,127 @@ def create_schema_and_tables(conn):
         );
         """)
 
-        # images
+        # images (UNLOGGED: re-runnable staging, so COPY skips the WAL)
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS raw.imat_images (
+        CREATE UNLOGGED TABLE IF NOT EXISTS raw.imat_images (
             split TEXT NOT NULL,
             image_id BIGINT NOT NULL,
             url TEXT NOT NULL,
             PRIMARY KEY (split, image_id)
         );
         """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS imat_images_image_id_idx ON raw.imat_images(image_id);")
 
         # annotations (label_ids is a JSON array of strings in your sample)
+        # UNLOGGED for the same reason as raw.imat_images
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS raw.imat_annotations (
+        CREATE UNLOGGED TABLE IF NOT EXISTS raw.imat_annotations (
             split TEXT NOT NULL,
             image_id BIGINT NOT NULL,
             label_ids JSONB NOT NULL,
             PRIMARY KEY (split, image_id)
         );
         """)
-        # create indexes for efficient querying
-        cursor.execute("CREATE INDEX IF NOT EXISTS imat_annotations_image_id_idx ON raw.imat_annotations(image_id);")
-        # GIN = Generalized Inverted Index.
-        cursor.execute("CREATE INDEX IF NOT EXISTS imat_annotations_label_ids_gin ON raw.imat_annotations USING GIN (label_ids);")
 
-def copy_rows(conn, table_name: str, columns, rows):
+# Bulk-loaded tables that are kept UNLOGGED while loading (see set_tables_logged)
+UNLOGGED_TABLES = ("raw.imat_images", "raw.imat_annotations")
+
+def set_tables_logged(conn, logged: bool):
     """
-    Bulk-load rows into Postgres using COPY ... FROM STDIN (FAST).
+    ALTER TABLE ... SET LOGGED / UNLOGGED for the bulk-loaded tables.
+
+    No-op for tables that already have the requested persistence. SET LOGGED
+    rewrites the table through the WAL, so only do it when crash safety matters.
+    """
+    persistence = sql.SQL("LOGGED" if logged else "UNLOGGED")
+    with conn.transaction(), conn.cursor() as cursor:
+        for table in UNLOGGED_TABLES:
+            cursor.execute(sql.SQL("ALTER TABLE {} SET {};").format(sql.SQL(table), persistence))
+
+# Secondary indexes for efficient querying. They are built after the bulk load
+# (see create_indexes): one pass is far cheaper than maintaining them per COPY row.
+IMAT_INDEXES = {
+    "imat_images_image_id_idx":
+        "CREATE INDEX IF NOT EXISTS imat_images_image_id_idx ON raw.imat_images(image_id);",
+    "imat_annotations_image_id_idx":
+        "CREATE INDEX IF NOT EXISTS imat_annotations_image_id_idx ON raw.imat_annotations(image_id);",
+    # GIN = Generalized Inverted Index.
+    "imat_annotations_label_ids_gin":
+        "CREATE INDEX IF NOT EXISTS imat_annotations_label_ids_gin ON raw.imat_annotations USING GIN (label_ids);",
+}
+
+# Memory for the post-load index builds (GIN especially benefits)
+INDEX_BUILD_MAINTENANCE_WORK_MEM = "2GB"
+
+def drop_indexes(conn):
+    with conn.cursor() as cursor:
+        for name in IMAT_INDEXES:
+            cursor.execute(sql.SQL("DROP INDEX IF EXISTS {};").format(sql.Identifier("raw", name)))
+
+def create_indexes(conn):
+    with conn.transaction(), conn.cursor() as cursor:
+        cursor.execute(
+            sql.SQL("SET LOCAL maintenance_work_mem = {};").format(
+                sql.Literal(INDEX_BUILD_MAINTENANCE_WORK_MEM)
+            )
+        )
+        for create_sql in IMAT_INDEXES.values():
+            cursor.execute(create_sql)
+    print(f"[OK] indexes built: {', '.join(IMAT_INDEXES)}")
+
+# Size of the chunks handed to COPY (bytes)
+COPY_CHUNK_SIZE = 1 << 20
+
+# COPY BINARY framing: signature + flags + header extension length, and trailer
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\0" + struct.pack(">ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack(">h", -1)
+
+# Per-column binary encoders: each appends one field (length + payload) to buf
+_NULL_FIELD = struct.pack(">i", -1)
+_pack_int8_field = struct.Struct(">iq").pack
+_pack_length = struct.Struct(">i").pack
+
+def encode_int8(buf: bytearray, value):
+    """BIGINT"""
+    if value is None:
+        buf += _NULL_FIELD
+    else:
+        buf += _pack_int8_field(8, value)
+
+def encode_text(buf: bytearray, value):
+    """TEXT (str is sent as UTF-8)"""
+    if value is None:
+        buf += _NULL_FIELD
+        return
+    data = value if isinstance(value, bytes) else value.encode("utf-8")
+    buf += _pack_length(len(data))
+    buf += data
+
+def encode_jsonb(buf: bytearray, value):
+    """JSONB (already serialized JSON text, prefixed with the version byte 1)"""
+    if value is None:
+        buf += _NULL_FIELD
+        return
+    data = value if isinstance(value, bytes) else value.encode("utf-8")
+    buf += _pack_length(len(data) + 1)
+    buf += b"\x01"
+    buf += data
+
+def copy_rows(conn, table_name: str, columns, rows, encoders, constants=()):
+    """
+    Bulk-load rows into Postgres using COPY ... FROM STDIN (FORMAT BINARY) (FAST).
 
     Args:
       conn: psycopg connection
       table_name: table to load into (prefer schema-qualified, e.g. "raw.imat_images")
       columns: list/tuple of column names in the order your row tuples are provided
-      rows: iterable of row tuples/lists, e.g. [("train", 1, "http://..."), ...]
+      rows: iterable of row tuples/lists holding the non-constant columns only,
+        e.g. [(1, "http://..."), ...] with constants=("train",)
+      encoders: one binary encoder per column (constants included),
+        e.g. (encode_text, encode_int8, encode_text)
+      constants: values for the leading columns that are the same for every row,
+        e.g. ("train",); they are encoded once and left out of each row
+
+    Returns the number of rows written.
     """
 
     with conn.cursor() as cursor:
@@ -108,86 +371,94 @@ def copy_rows(conn, table_name: str, columns, rows):
 
         # Build the COPY command.
         # Example result:
-        #   COPY raw.imat_images (split, image_id, url) FROM STDIN WITH (FORMAT CSV)
+        #   COPY raw.imat_images (split, image_id, url) FROM STDIN WITH (FORMAT BINARY)
         #
         # NOTE: table_name is injected as raw SQL here via sql.SQL(table_name).
         # That is OK if table_name is a constant you control (not user input).
-        q = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT CSV)").format(
+        q = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT BINARY)").format(
             sql.SQL(table_name),
             col_list
         )
 
-        # Start COPY streaming session
-        with cursor.copy(q) as copy:
-            # Create an in-memory "file" where csv.writer can write one CSV line
-            wbuf = StringIO()
-            writer = csv.writer(wbuf)
+        # Field count + constant fields are identical for every row: encode them once
+        row_prefix = bytearray(struct.pack(">h", len(columns)))
+        for enc, v in zip(encoders, constants):
+            enc(row_prefix, v)
+        row_prefix = bytes(row_prefix)
+        row_encoders = encoders[len(constants):]
+
+        # Start COPY streaming session. QueuedLibpqWriter hands the chunks to a
+        # background thread that pushes them to the socket, so parsing and
+        # encoding the next rows overlaps with sending the previous ones.
+        with cursor.copy(q, writer=QueuedLibpqWriter(cursor)) as copy:
+            # Accumulate encoded rows in one reusable buffer and hand
+            # it to COPY in large chunks instead of one write per row
+            buf = bytearray(_PGCOPY_HEADER)
+            total = 0
 
-            # Stream each row into COPY
             for r in rows:
-                # Clear the buffer (so we reuse the same StringIO object)
-                wbuf.seek(0)
-                wbuf.truncate(0)
+                buf += row_prefix
+                for enc, v in zip(row_encoders, r):
+                    enc(buf, v)
+                total += 1
 
-                # Convert the Python row into a single CSV line (handles quoting/commas safely)
-                writer.writerow(r)
+                if len(buf) >= COPY_CHUNK_SIZE:
+                    copy.write(buf)
+                    buf = bytearray()
 
-                # Send that CSV line to Postgres COPY stream
-                copy.write(wbuf.getvalue())
+            buf += _PGCOPY_TRAILER
+            copy.write(buf)
+
+    return total
 
 
 def load_label_map(conn, xlsx_path: Path):
     if not xlsx_path.exists():
         raise FileNotFoundError(xlsx_path)
 
-    df = pd.read_excel(xlsx_path)
+    # calamine (Rust, needs python-calamine) is much faster than the default openpyxl
+    df = pd.read_excel(xlsx_path, engine="calamine")
 
     with conn.cursor() as cursor:
         cursor.execute("TRUNCATE raw.imat_label_map;")
 
-    def generate():
-        for _, row in df.iterrows():
-            yield (
-                int(row["labelId"]),
-                int(row["taskId"]),
-                str(row["labelName"]),
-                str(row["taskName"]),
-            )
-
-    copy_rows(
-        conn,
-        "raw.imat_label_map",
-        ("label_id", "task_id", "label_name", "task_name"),
-        generate()
-    )
+    # The map is small: one INSERT over unnest()ed column arrays is cheaper
+    # than setting up a COPY session. tolist() yields plain Python ints/strs.
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO raw.imat_label_map (label_id, task_id, label_name, task_name)
+            SELECT * FROM unnest(%s::int[], %s::int[], %s::text[], %s::text[]);
+            """,
+            (
+                df["labelId"].astype("int64").tolist(),
+                df["taskId"].astype("int64").tolist(),
+                df["labelName"].astype(str).tolist(),
+                df["taskName"].astype(str).tolist(),
+            ),
+        )
     print(f"[OK] label_map loaded: {len(df)} rows -> raw.imat_label_map")
 
-def load_imat_split_info_and_license(conn, json_path: Path, split: str):
+def load_imat_split_info_and_license(conn, json_path: Path, split: str, doc=None):
     if not json_path.exists():
         raise FileNotFoundError(json_path)
 
-    with json_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    info_obj = data.get("info")
-    license_obj = data.get("license")
+    values = first_split_values(json_path, ("info", "license"), doc)
+    info_obj = values["info"]
+    license_obj = values["license"]
 
     # validation.json may not contain these; that's OK
     if info_obj is None and license_obj is None:
         print(f"[SKIP] {split}: no info/license in {json_path.name}")
         return
 
-    # Re-runnable: delete any existing rows for this split
-    with conn.cursor() as cursor:
-        cursor.execute("DELETE FROM raw.imat_info WHERE split = %s;", (split,))
-        cursor.execute("DELETE FROM raw.imat_license WHERE split = %s;", (split,))
-
     if info_obj is not None:
         copy_rows(
             conn,
             "raw.imat_info",
             ("split", "info"),
-            [(split, json.dumps(info_obj, ensure_ascii=False))]
+            [(split, to_json_bytes(info_obj))],
+            (encode_text, encode_jsonb),
         )
 
     if license_obj is not None:
@@ -195,112 +466,158 @@ def load_imat_split_info_and_license(conn, json_path: Path, split: str):
             conn,
             "raw.imat_license",
             ("split", "license"),
-            [(split, json.dumps(license_obj, ensure_ascii=False))]
+            [(split, to_json_bytes(license_obj))],
+            (encode_text, encode_jsonb),
         )
 
     print(f"[OK] {split}: loaded info/license (if present)")
 
-def load_imat_split_images(conn, json_path: Path, split: str, batch_size: int = 20000):
+def load_imat_split_images(conn, json_path: Path, split: str, doc=None):
     """
-    Streams data["images"] array from the JSON and loads into raw.imat_images:
+    Reads data["images"] array from the JSON and loads into raw.imat_images:
       (split, image_id, url)
 
-    Re-runnable: delete existing rows for this split first.
+    Expects the split's old rows to be gone already (see reset_split).
     """
     if not json_path.exists():
         raise FileNotFoundError(json_path)
 
-    # Remove old rows for this split (re-runnable)
-    with conn.cursor() as cursor:
-        cursor.execute("DELETE FROM raw.imat_images WHERE split = %s;", (split,))
-
-    total = 0
-    buffer = []
-
-    def flush():
-        nonlocal total
-        if not buffer:
-            return
-        copy_rows(conn, "raw.imat_images", ("split", "image_id", "url"), buffer)
-        total += len(buffer)
-        buffer.clear()
-
-    with json_path.open("rb") as f:
-        # ijson.items(f, "images.item") streams each item inside the images array
-        for img in tqdm(ijson.items(f, "images.item"), desc=f"iMAT {split} images"):
+    def generate():
+        items = iter_split_items(json_path, "images", doc)
+        for img in tqdm(items, desc=f"iMAT {split} images"):
             # img expected like: {"url": "...", "imageId": "1"}
-            image_id = int(img["imageId"])
-            url = str(img["url"])
-
-            buffer.append((split, image_id, url))
-            if len(buffer) >= batch_size:
-                flush()
+            yield (int(img["imageId"]), str(img["url"]))
 
-    flush()
+    # Rows stream straight into one COPY; its chunked buffer is the only batching
+    total = copy_rows(
+        conn,
+        "raw.imat_images",
+        ("split", "image_id", "url"),
+        generate(),
+        (encode_text, encode_int8, encode_text),
+        constants=(split,),
+    )
     print(f"[OK] {split}: loaded images -> raw.imat_images ({total} rows)")
 
-def load_imat_split_annotations(conn, json_path: Path, split: str, batch_size: int = 20000):
+def load_imat_split_annotations(conn, json_path: Path, split: str, doc=None):
     """
-    Streams data["annotations"] array and loads into raw.imat_annotations:
+    Reads data["annotations"] array and loads into raw.imat_annotations:
       (split, image_id, label_ids)
 
-    label_ids is stored as JSONB array (we send a JSON string).
-    Re-runnable: delete existing rows for this split first.
+    label_ids is stored as JSONB array (we send the serialized JSON text).
+    Expects the split's old rows to be gone already (see reset_split).
     """
     if not json_path.exists():
         raise FileNotFoundError(json_path)
 
-    # Remove old rows for this split (re-runnable)
-    with conn.cursor() as cursor:
-        cursor.execute("DELETE FROM raw.imat_annotations WHERE split = %s;", (split,))
+    label_json_cache = {}
 
-    total = 0
-    buffer = []
-
-    def flush():
-        nonlocal total
-        if not buffer:
-            return
-        copy_rows(conn, "raw.imat_annotations", ("split", "image_id", "label_ids"), buffer)
-        total += len(buffer)
-        buffer.clear()
-
-    with json_path.open("rb") as f:
-        for ann in tqdm(ijson.items(f, "annotations.item"), desc=f"iMAT {split} annotations"):
+    def generate():
+        items = iter_split_items(json_path, "annotations", doc)
+        for ann in tqdm(items, desc=f"iMAT {split} annotations"):
             # ann expected like: {"labelId": ["95","66",...], "imageId": "1"}
             image_id = int(ann["imageId"])
             label_ids = ann["labelId"]  # list of strings in your sample
 
-            # Store as JSONB: must be valid JSON string
-            buffer.append((split, image_id, json.dumps(label_ids, ensure_ascii=False)))
-
-            if len(buffer) >= batch_size:
-                flush()
+            # Store as JSONB: must be valid JSON (bytes go to COPY as-is)
+            yield (image_id, cached_json_bytes(label_json_cache, label_ids))
 
-    flush()
+    # Rows stream straight into one COPY; its chunked buffer is the only batching
+    total = copy_rows(
+        conn,
+        "raw.imat_annotations",
+        ("split", "image_id", "label_ids"),
+        generate(),
+        (encode_text, encode_int8, encode_jsonb),
+        constants=(split,),
+    )
     print(f"[OK] {split}: loaded annotations -> raw.imat_annotations ({total} rows)")
 
-def load_imat_split(conn, json_path: Path, split: str):
+def reset_split(conn, split: str):
+    """
+    Deletes one split's rows from all four raw tables in a single statement
+    (one round trip; data-modifying CTEs all run).
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH info AS (DELETE FROM raw.imat_info WHERE split = %(split)s),
+                 license AS (DELETE FROM raw.imat_license WHERE split = %(split)s),
+                 images AS (DELETE FROM raw.imat_images WHERE split = %(split)s)
+            DELETE FROM raw.imat_annotations WHERE split = %(split)s;
+            """,
+            {"split": split},
+        )
+
+def truncate_splits(conn):
+    """
+    Full refresh: empties all four raw tables at once (much cheaper than DELETE).
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("TRUNCATE raw.imat_info, raw.imat_license, raw.imat_images, raw.imat_annotations;")
+
+def load_imat_split(conn, json_path: Path, split: str, streaming: bool = False, reset: bool = True):
     """
     Convenience wrapper: loads one split JSON into all four raw tables.
+
+    Re-runnable: deletes the split's existing rows first, unless reset=False
+    (the caller already emptied the tables, e.g. with truncate_splits).
     """
-    load_imat_split_info_and_license(conn, json_path, split)
-    load_imat_split_images(conn, json_path, split)
-    load_imat_split_annotations(conn, json_path, split)
+    with conn.transaction(), conn.cursor() as cursor:
+        # Losing the last commit on a crash is fine: the load is re-runnable
+        cursor.execute("SET LOCAL synchronous_commit = off;")
+
+        if reset:
+            reset_split(conn, split)
+        # Parse once (simdjson) and share the document; None means stream with ijson
+        doc = parse_split_doc(json_path, streaming)
+        load_imat_split_info_and_license(conn, json_path, split, doc=doc)
+        load_imat_split_images(conn, json_path, split, doc=doc)
+        load_imat_split_annotations(conn, json_path, split, doc=doc)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--imat-dir", default="imat", help="Path to imat directory")
+    ap.add_argument("--streaming", action="store_true", help="Stream JSON with ijson instead of simdjson (low memory)")
+    ap.add_argument("--workers", type=int, default=3, help="Parallel load processes (label map / train / validation)")
+    ap.add_argument("--set-logged", action="store_true", help="Make the loaded tables LOGGED (crash-safe) after loading")
     args = ap.parse_args()
 
     imat_dir = Path(args.imat_dir).resolve()
 
     conn = get_conn()
     try:
-        create_schema_and_tables(conn)
-        load_label_map(conn, imat_dir / "label_map_228.xlsx")
-        load_imat_split(conn, imat_dir / "train.json", "train")
-        load_imat_split(conn, imat_dir / "validation.json", "validation")
+        # Commit the setup before the workers start: they would block on its locks
+        with conn.transaction():
+            create_schema_and_tables(conn)
+
+            # Every split is reloaded: empty the tables once instead of per-split DELETEs
+            truncate_splits(conn)
+
+            # Load into unlogged, unindexed tables, then build the indexes once.
+            # SET UNLOGGED rewrites the table and its indexes, so do it last, on
+            # empty, unindexed tables.
+            drop_indexes(conn)
+            set_tables_logged(conn, False)
+
+        try:
+            # Each load runs in its own process with its own connection and COPY
+            # streams; Postgres accepts concurrent COPY into the same table
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                jobs = [
+                    pool.submit(run_with_own_conn, load_label_map, imat_dir / "label_map_228.xlsx"),
+                    pool.submit(run_with_own_conn, load_imat_split, imat_dir / "train.json", "train", streaming=args.streaming, reset=False),
+                    pool.submit(run_with_own_conn, load_imat_split, imat_dir / "validation.json", "validation", streaming=args.streaming, reset=False),
+                ]
+                for job in jobs:
+                    job.result()
+        finally:
+            # Even if a load failed, never leave the tables without their
+            # indexes (dbt queries rely on them)
+            create_indexes(conn)
+
+        if args.set_logged:
+            set_tables_logged(conn, True)
     finally:
         conn.close()
 
@@ -1,15 +1,22 @@
-import json
+import ijson
 
-with open("imat/train.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
+# Same backend preference as load_imat_to_postgres.py: YAJL2 C-based first,
+# ijson's default (possibly pure Python) as a last resort
+for name in ("yajl2_c", "yajl2_cffi", "yajl2"):
+    try:
+        ijson = ijson.get_backend(name)
+        break
+    except ImportError:
+        continue
 
-# print(data.keys())
-for annotation in data.keys():
-    # print(annotation)
-    break  # just print the first annotation
+JSON_PATH = "imat/train.json"
 
-print(data.keys())
-print(data["annotations"][0])
-print(data["images"][0])
-print(data["info"])
-print(data["license"])
\ No newline at end of file
+def first(prefix):
+    # Stream the file and stop at the first match instead of json.load-ing it all
+    with open(JSON_PATH, "rb") as f:
+        return next(ijson.items(f, prefix, buf_size=256 * 1024), None)
+
+print(first("annotations.item"))
+print(first("images.item"))
+print(first("info"))
+print(first("license"))
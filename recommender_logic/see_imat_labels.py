@@ -1,10 +1,22 @@
+from pathlib import Path
+
 import pandas as pd
 
-df = pd.read_excel("imat/label_map_228.xlsx")
+XLSX_PATH = Path("imat/label_map_228.xlsx")
+PARQUET_PATH = Path("imat/label_map_228.parquet")
+
+# Parsing the xlsx dominates the runtime: convert it to Parquet once
+# (again only if the xlsx changes) and read that instead
+if not PARQUET_PATH.exists() or PARQUET_PATH.stat().st_mtime < XLSX_PATH.stat().st_mtime:
+    pd.read_excel(XLSX_PATH, engine="calamine").to_parquet(PARQUET_PATH)
 
-# materials_draft = df[["taskName", "labelName"]]
+df = pd.read_parquet(PARQUET_PATH)
 
-# materials_only = materials_draft[materials_draft["taskName"] == "material"]
+# materials_only = pd.read_parquet(
+#     PARQUET_PATH,
+#     columns=["labelId", "labelName", "taskName"],
+#     filters=[("taskName", "==", "material")],
+# )
 # print(materials_only)
 
 print(df.columns)